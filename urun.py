@@ -1,20 +1,20 @@
 import os
+import atexit
 import json
+import stat
+import bisect
 import subprocess
+import importlib.util
 import sys
 import logging
-import tkinter as tk
-from tkinter import filedialog
+import threading
+from collections import defaultdict
 
-# Import winreg for Windows-specific PATH modification
-if sys.platform == "win32":
-    try:
-        import winreg
-    except ImportError:
-        winreg = None
-        logging.warning("winreg module not found. PATH modification feature will be limited.")
-else:
-    winreg = None # Not applicable for other OS
+# orjson is optional; it parses and serializes much faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # --- Configuration for Data and Log Files ---
 def get_app_data_path():
@@ -35,19 +35,27 @@ os.makedirs(APP_DATA_DIR, exist_ok=True) # Ensure the directory exists
 DATA_FILE = os.path.join(APP_DATA_DIR, 'launcher_data.json')
 LOG_FILE = os.path.join(APP_DATA_DIR, 'launcher.log')
 
+# Keys in the data file that hold launcher settings rather than entries
+SETTING_KEYS = ('path_set_attempted',)
+
+# File extensions that are considered directly launchable
+EXECUTABLE_EXTENSIONS = frozenset({'.exe', '.bat', '.cmd', '.ps1'})
+
 # --- Logging Setup ---
-# Get the root logger
-logger = logging.getLogger()
+# Plain user-facing output is printed directly; this logger carries warnings and
+# errors, which are shown on the console and also kept in the log file.
+logger = logging.getLogger('urun')
 logger.setLevel(logging.INFO) # Set the default level for the logger
 
 # Prevent adding duplicate handlers if the script is run multiple times
 if not logger.handlers:
-    # File handler for detailed logs
+    # File handler for the audit log; only warnings and errors are written to disk
     file_handler = logging.FileHandler(LOG_FILE, mode='a')
+    file_handler.setLevel(logging.WARNING)
     file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
     logger.addHandler(file_handler)
 
-    # Console handler for user-facing messages
+    # Console handler so warnings and errors are also shown to the user
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO) # Show INFO, WARNING, ERROR on console
     console_handler.setFormatter(logging.Formatter('%(message)s')) # Only show message on console
@@ -58,152 +66,294 @@ def load_executables():
     """Loads the executable mapping from the data file."""
     if os.path.exists(DATA_FILE):
         try:
-            with open(DATA_FILE, 'r') as f:
-                executables = json.load(f)
-                logging.debug(f"Loaded {len(executables)} executables from '{DATA_FILE}'.")
-                return executables
+            with open(DATA_FILE, 'rb') as f:
+                data = f.read()
+            executables = orjson.loads(data) if orjson is not None else json.loads(data)
+            logger.debug(f"Loaded {len(executables)} executables from '{DATA_FILE}'.")
+            return executables
         except json.JSONDecodeError:
-            logging.warning(f"Warning: {DATA_FILE} is corrupted. Starting with an empty list.")
-            logging.error(f"JSONDecodeError: {DATA_FILE} is corrupted.", exc_info=True)
+            logger.warning(f"Warning: {DATA_FILE} is corrupted. Starting with an empty list.")
+            logger.error(f"JSONDecodeError: {DATA_FILE} is corrupted.", exc_info=True)
             return {}
         except Exception as e:
-            logging.error(f"Error loading data from {DATA_FILE}: {e}", exc_info=True)
+            logger.error(f"Error loading data from {DATA_FILE}: {e}", exc_info=True)
             return {}
-    logging.debug(f"No existing data file found at '{DATA_FILE}'. Starting fresh.")
+    logger.debug(f"No existing data file found at '{DATA_FILE}'. Starting fresh.")
     return {}
 
 def save_executables(executables):
     """Saves the current executable mapping to the data file."""
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(executables, f, indent=4)
-        logging.debug(f"Executables saved to '{DATA_FILE}'.")
+        # Serialize up front so the whole document reaches the file in a single write
+        if orjson is not None:
+            data = orjson.dumps(executables, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(executables, indent=2, ensure_ascii=False).encode('utf-8')
+        # Write to a temporary file and swap it in, so a crash mid-write
+        # can never leave a truncated data file behind
+        tmp_file = DATA_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, DATA_FILE)
+        logger.debug(f"Executables saved to '{DATA_FILE}'.")
+        return True
     except IOError as e:
-        logging.error(f"Error: Could not save data to {DATA_FILE}. Reason: {e}", exc_info=True)
+        logger.error(f"Error: Could not save data to {DATA_FILE}. Reason: {e}", exc_info=True)
     except Exception as e:
-        logging.error(f"An unexpected error occurred while saving data: {e}", exc_info=True)
+        logger.error(f"An unexpected error occurred while saving data: {e}", exc_info=True)
+    return False
+
+def has_executable_extension(path):
+    """Returns True if the path ends in one of the common executable extensions."""
+    return os.path.splitext(path)[1].lower() in EXECUTABLE_EXTENSIONS
 
-def add_entry(executables, alias, path, entry_type="file"):
+def classify_path(path):
+    """
+    Determines what a path points to with a single stat.
+    Returns 'file', 'folder' or 'other' for existing paths, None if the path
+    does not exist, and 'error' if it could not be checked.
+    """
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except (OSError, ValueError):
+        return "error"
+    if stat.S_ISREG(st.st_mode):
+        return "file"
+    if stat.S_ISDIR(st.st_mode):
+        return "folder"
+    return "other"
+
+def make_entry(path, entry_type):
+    """Builds a stored entry; entry_type is 'file' or 'folder'."""
+    return {'path': path, 'type': entry_type}
+
+class ExecutableStore:
+    """
+    Holds the executable mapping in memory and writes it back to the data file
+    only when it has been modified since the last flush.
+    Entries are stored as {'path': ..., 'type': 'file' | 'folder'} so that
+    listing and launching do not have to work out the type again.
+    """
+
+    def __init__(self, data):
+        self.settings = {key: data.pop(key) for key in SETTING_KEYS if key in data}
+        self.data = data
+        self.dirty = False
+        # Older data files map aliases straight to path strings; upgrade them once
+        for alias, entry in data.items():
+            if isinstance(entry, str):
+                entry_type = "folder" if classify_path(entry) == "folder" else "file"
+                data[alias] = make_entry(entry, entry_type)
+                self.dirty = True
+        # Kept in order as entries are added and removed, so it is only sorted once
+        self.sorted_aliases = sorted(data)
+
+    def mark_dirty(self):
+        """Records that the mapping has unsaved changes."""
+        self.dirty = True
+
+    def set(self, alias, value):
+        """Adds or replaces an entry, keeping the sorted alias list in step."""
+        if alias not in self.data:
+            bisect.insort(self.sorted_aliases, alias)
+        self.data[alias] = value
+        self.mark_dirty()
+
+    def remove(self, alias):
+        """Removes an entry and returns its value."""
+        value = self.data.pop(alias)
+        del self.sorted_aliases[bisect.bisect_left(self.sorted_aliases, alias)]
+        self.mark_dirty()
+        return value
+
+    def flush(self):
+        """Saves the mapping to the data file if there are unsaved changes."""
+        if self.dirty and save_executables({**self.data, **self.settings}):
+            self.dirty = False
+
+def add_entry(store, alias, path, entry_type="file"):
     """
     Adds a new entry (file or folder) to the mapping or updates an existing one.
     Validates path based on entry_type.
     """
-    if not os.path.exists(path):
-        logging.error(f"Error: The path '{path}' does not exist. Please provide a valid path.")
+    executables = store.data
+    path_type = classify_path(path)
+    if path_type is None:
+        logger.error(f"Error: The path '{path}' does not exist. Please provide a valid path.")
+        return False
+    if path_type == "error":
+        logger.error(f"Error: The path '{path}' could not be accessed. Please check that you have permission to read it.")
         return False
 
     if entry_type == "file":
-        if not os.path.isfile(path):
-            logging.error(f"Error: The path '{path}' is not a file. Please provide the path to a file.")
+        if path_type != "file":
+            logger.error(f"Error: The path '{path}' is not a file. Please provide the path to a file.")
             return False
         # General warning for non-typical executable extensions
-        if not path.lower().endswith(('.exe', '.bat', '.cmd', '.ps1')):
-            logging.warning(f"Warning: The file '{path}' does not have a common executable extension (.exe, .bat, etc.). Ensure it's launchable.")
+        if not has_executable_extension(path):
+            logger.warning(f"Warning: The file '{path}' does not have a common executable extension (.exe, .bat, etc.). Ensure it's launchable.")
     elif entry_type == "folder":
-        if not os.path.isdir(path):
-            logging.error(f"Error: The path '{path}' is not a directory. Please provide the path to a folder.")
+        if path_type != "folder":
+            logger.error(f"Error: The path '{path}' is not a directory. Please provide the path to a folder.")
             return False
     else:
-        logging.error(f"Invalid entry type specified: {entry_type}. Must be 'file' or 'folder'.")
+        logger.error(f"Invalid entry type specified: {entry_type}. Must be 'file' or 'folder'.")
         return False
 
     alias_lower = alias.lower()
+    entry = make_entry(path, entry_type)
+    if executables.get(alias_lower) == entry:
+        # Re-adding the same mapping; nothing changes, so skip the save
+        print(f"Alias '{alias}' already points to '{path}'. Nothing to update.")
+        return True
     if alias_lower in executables:
-        logging.info(f"Alias '{alias}' already exists. Updating path from '{executables[alias_lower]}' to '{path}'.")
+        print(f"Alias '{alias}' already exists. Updating path from '{executables[alias_lower]['path']}' to '{path}'.")
     else:
-        logging.info(f"Adding new alias '{alias}' with path '{path}'.")
+        print(f"Adding new alias '{alias}' with path '{path}'.")
 
-    executables[alias_lower] = path
-    save_executables(executables)
-    logging.info(f"'{alias}' added/updated successfully as a {entry_type}.")
+    store.set(alias_lower, entry)
+    print(f"'{alias}' added/updated successfully as a {entry_type}.")
     return True
 
-def update_entry(executables, alias, new_path):
+def update_entry(store, alias, new_path):
     """
     Updates the path for an existing alias.
     Determines if it's a file or folder based on the new path.
     """
+    executables = store.data
     alias_lower = alias.lower()
     if alias_lower not in executables:
-        logging.error(f"Error: Alias '{alias}' not found. Use 'add' to create a new entry.")
+        logger.error(f"Error: Alias '{alias}' not found. Use 'add' to create a new entry.")
         return False
 
-    if not os.path.exists(new_path):
-        logging.error(f"Error: The new path '{new_path}' does not exist. Please provide a valid path.")
+    entry_type = classify_path(new_path)
+    if entry_type is None:
+        logger.error(f"Error: The new path '{new_path}' does not exist. Please provide a valid path.")
+        return False
+    if entry_type == "error":
+        logger.error(f"Error: The new path '{new_path}' could not be accessed. Please check that you have permission to read it.")
         return False
 
-    entry_type = "file"
-    if os.path.isfile(new_path):
+    if entry_type == "file":
         # General warning for non-typical executable extensions
-        if not new_path.lower().endswith(('.exe', '.bat', '.cmd', '.ps1')):
-            logging.warning(f"Warning: The new file '{new_path}' does not have a common executable extension (.exe, .bat, etc.). Ensure it's launchable.")
-    elif os.path.isdir(new_path):
-        entry_type = "folder"
-    else:
-        logging.error(f"Error: The new path '{new_path}' is neither a file nor a directory.")
+        if not has_executable_extension(new_path):
+            logger.warning(f"Warning: The new file '{new_path}' does not have a common executable extension (.exe, .bat, etc.). Ensure it's launchable.")
+    elif entry_type != "folder":
+        logger.error(f"Error: The new path '{new_path}' is neither a file nor a directory.")
         return False
 
-    old_path = executables[alias_lower]
-    executables[alias_lower] = new_path
-    save_executables(executables)
-    logging.info(f"Path for '{alias}' updated from '{old_path}' to '{new_path}' (type: {entry_type}).")
+    old_entry = executables[alias_lower]
+    old_path = old_entry['path']
+    new_entry = make_entry(new_path, entry_type)
+    if old_entry == new_entry:
+        print(f"Alias '{alias}' already points to '{new_path}'. Nothing to update.")
+        return True
+    store.set(alias_lower, new_entry)
+    print(f"Path for '{alias}' updated from '{old_path}' to '{new_path}' (type: {entry_type}).")
     return True
 
-def delete_executable(executables, alias):
+def delete_executable(store, alias):
     """
     Deletes an executable by its alias with confirmation.
     """
+    executables = store.data
     alias_lower = alias.lower()
     if alias_lower not in executables:
-        logging.error(f"Error: Alias '{alias}' not found.")
+        logger.error(f"Error: Alias '{alias}' not found.")
         return False
 
-    confirm = input(f"Are you sure you want to delete '{alias}' (path: {executables[alias_lower]})? (y/n): ").strip().lower()
+    confirm = input(f"Are you sure you want to delete '{alias}' (path: {executables[alias_lower]['path']})? (y/n): ").strip().lower()
     if confirm == 'y':
-        del executables[alias_lower]
-        save_executables(executables)
-        logging.info(f"'{alias}' has been successfully removed.")
+        store.remove(alias_lower)
+        print(f"'{alias}' has been successfully removed.")
         return True
     else:
-        logging.info(f"Deletion of '{alias}' cancelled.")
+        print(f"Deletion of '{alias}' cancelled.")
         return False
 
-def rename_alias(executables, old_alias, new_alias):
+def rename_alias(store, old_alias, new_alias):
     """
     Renames an existing alias to a new alias.
     """
+    executables = store.data
     old_alias_lower = old_alias.lower()
     new_alias_lower = new_alias.lower()
 
     if old_alias_lower not in executables:
-        logging.error(f"Error: Old alias '{old_alias}' not found.")
+        logger.error(f"Error: Old alias '{old_alias}' not found.")
         return False
     if new_alias_lower in executables:
-        logging.error(f"Error: New alias '{new_alias}' already exists. Please choose a different name.")
+        logger.error(f"Error: New alias '{new_alias}' already exists. Please choose a different name.")
         return False
 
-    executables[new_alias_lower] = executables.pop(old_alias_lower) # Move the value and delete old key
-    save_executables(executables)
-    logging.info(f"Alias '{old_alias}' successfully renamed to '{new_alias}'.")
+    store.set(new_alias_lower, store.remove(old_alias_lower)) # Move the value and delete old key
+    print(f"Alias '{old_alias}' successfully renamed to '{new_alias}'.")
     return True
 
 
-def list_executables(executables):
+def classify_entries(executables, aliases):
+    """
+    Returns a mapping of alias -> 'File', 'Folder' or 'MISSING' for the given aliases.
+    The type comes from the stored entry, so the disk is only consulted to see
+    whether the path still exists. Entries that share a parent directory are
+    checked with a single os.scandir of that directory instead of one stat per path.
+    """
+    present = set()
+    by_dir = defaultdict(lambda: defaultdict(list)) # parent dir -> entry name -> aliases
+    for alias in aliases:
+        path = executables[alias]['path']
+        parent, name = os.path.split(os.path.normpath(path))
+        if name:
+            by_dir[parent or os.curdir][os.path.normcase(name)].append(alias)
+        elif os.path.exists(path):
+            present.add(alias)
+
+    for parent, names in by_dir.items():
+        if sum(len(group) for group in names.values()) == 1:
+            # Scanning a whole directory for one entry costs more than a stat
+            for group in names.values():
+                if os.path.exists(executables[group[0]]['path']):
+                    present.add(group[0])
+            continue
+        found = set()
+        try:
+            with os.scandir(parent) as it:
+                for entry in it:
+                    group = names.get(os.path.normcase(entry.name))
+                    # A listed symlink may be dangling, so only trust it if its target exists
+                    if group and (not entry.is_symlink() or os.path.exists(entry.path)):
+                        found.update(group)
+        except OSError:
+            pass # Parent directory is gone or unreadable; the stat fallback below decides
+        present.update(found)
+        # normcase does not know every filesystem's rules (e.g. case-insensitive
+        # macOS volumes), so names the scan did not match get a regular stat
+        for group in names.values():
+            for alias in group:
+                if alias not in found and os.path.exists(executables[alias]['path']):
+                    present.add(alias)
+
+    return {alias: executables[alias]['type'].capitalize() if alias in present else "MISSING" for alias in aliases}
+
+def list_executables(store):
     """Lists all registered executables."""
+    executables = store.data
     if not executables:
-        logging.info("No entries registered yet. Use 'add <alias> <path>' or 'add_folder <alias> <path>' to add one.")
+        print("No entries registered yet. Use 'add <alias> <path>' or 'add_folder <alias> <path>' to add one.")
         return
 
-    logging.info("\n--- Registered Entries ---")
-    for alias, path in sorted(executables.items()):
-        entry_type = "File"
-        if os.path.isdir(path):
-            entry_type = "Folder"
-        elif not os.path.exists(path):
-            entry_type = "MISSING"
-        logging.info(f"  {alias:<15} -> {path} ({entry_type})")
-    logging.info("----------------------------\n")
-    logging.info("Listed all entries.")
+    entry_types = classify_entries(executables, store.sorted_aliases)
+    print("\n--- Registered Entries ---")
+    for alias in store.sorted_aliases:
+        path = executables[alias]['path']
+        entry_type = entry_types[alias]
+        print(f"  {alias:<15} -> {path} ({entry_type})")
+    print("----------------------------\n")
+    print("Listed all entries.")
 
 def launch_entry(executables, alias):
     """
@@ -211,74 +361,108 @@ def launch_entry(executables, alias):
     For .exe files, uses subprocess.Popen with shell=False and cwd for better compatibility.
     For other files/folders, uses os.startfile.
     """
-    path = executables.get(alias.lower())
-    if path:
-        if os.path.exists(path):
-            try:
-                logging.info(f"Launching '{alias}' from '{path}'...")
-                if os.path.isfile(path) and path.lower().endswith('.exe'):
-                    # Set the working directory to the executable's directory
-                    working_dir = os.path.dirname(path)
-                    # Use subprocess.Popen without shell=True for cleaner process creation
-                    # and explicitly set cwd for games that rely on it.
-                    subprocess.Popen([path], cwd=working_dir)
-                else:
-                    # For other files (media, docs) and folders, os.startfile is generally sufficient.
-                    os.startfile(path)
-                logging.info(f"'{alias}' launched successfully. You can continue using Urun.")
-            except OSError as e:
-                logging.error(f"Error launching '{alias}': {e}")
-                logging.info("Please ensure the path is correct and you have permission to access it.")
-            except Exception as e:
-                logging.error(f"An unexpected error occurred while launching '{alias}': {e}", exc_info=True)
-        else:
-            logging.error(f"Error: Path for '{alias}' ('{path}') no longer exists. Consider updating or removing it.")
+    entry = executables.get(alias.lower())
+    if entry:
+        path = entry['path']
+        # No existence pre-check: a missing path surfaces as FileNotFoundError from the launch itself,
+        # and the stored type tells files from folders without a stat
+        try:
+            print(f"Launching '{alias}' from '{path}'...")
+            if entry['type'] == "file" and path.lower().endswith('.exe'):
+                # Set the working directory to the executable's directory
+                working_dir = os.path.dirname(path)
+                # Use subprocess.Popen without shell=True for cleaner process creation
+                # and explicitly set cwd for games that rely on it.
+                subprocess.Popen([path], cwd=working_dir)
+            elif hasattr(os, 'startfile'):
+                # For other files (media, docs) and folders, os.startfile is generally sufficient.
+                os.startfile(path)
+            elif not os.path.exists(path):
+                raise FileNotFoundError(path)
+            else:
+                logger.error(f"Error: Cannot open '{alias}': 'os.startfile' is only available on Windows.")
+                return
+            print(f"'{alias}' launched successfully. You can continue using Urun.")
+        except FileNotFoundError:
+            logger.error(f"Error: Path for '{alias}' ('{path}') no longer exists. Consider updating or removing it.")
+        except OSError as e:
+            logger.error(f"Error launching '{alias}': {e}")
+            print("Please ensure the path is correct and you have permission to access it.")
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while launching '{alias}': {e}", exc_info=True)
     else:
-        logging.error(f"Error: Alias '{alias}' not found. Use 'list' to see available entries.")
+        logger.error(f"Error: Alias '{alias}' not found. Use 'list' to see available entries.")
 
-def search_and_launch(executables, query):
+def search_and_launch(store, query):
     """
     Searches for entries matching the query.
+    An exact alias is launched directly; otherwise aliases starting with the query
+    are preferred, falling back to aliases containing it anywhere.
     If a single match, launches it. If multiple, lists them.
     """
+    executables = store.data
     query_lower = query.lower()
-    matches = {alias: path for alias, path in executables.items() if query_lower in alias}
+    if query_lower in executables:
+        launch_entry(executables, query_lower)
+        return
+
+    # Prefix matches form a contiguous run in the sorted alias list
+    sorted_aliases = store.sorted_aliases
+    matches = {}
+    for i in range(bisect.bisect_left(sorted_aliases, query_lower), len(sorted_aliases)):
+        alias = sorted_aliases[i]
+        if not alias.startswith(query_lower):
+            break
+        matches[alias] = executables[alias]
+    if not matches:
+        matches = {alias: executables[alias] for alias in sorted_aliases if query_lower in alias}
 
     if not matches:
-        logging.info(f"No entries found matching '{query}'.")
+        print(f"No entries found matching '{query}'.")
     elif len(matches) == 1:
         alias = list(matches.keys())[0]
         launch_entry(executables, alias)
     else:
-        logging.info(f"Multiple entries found matching '{query}':")
-        for alias, path in sorted(matches.items()):
-            entry_type = "File"
-            if os.path.isdir(path):
-                entry_type = "Folder"
-            elif not os.path.exists(path):
-                entry_type = "MISSING"
-            logging.info(f"  - {alias} ({path}) ({entry_type})")
-        logging.info(f"Please be more specific, or type the full alias to launch (e.g., '{list(matches.keys())[0]}').")
+        print(f"Multiple entries found matching '{query}':")
+        entry_types = classify_entries(executables, matches)
+        for alias, entry in matches.items(): # Already in alias order
+            print(f"  - {alias} ({entry['path']}) ({entry_types[alias]})")
+        print(f"Please be more specific, or type the full alias to launch (e.g., '{list(matches.keys())[0]}').")
+
+# Hidden Tkinter root shared by the browse dialogs; created on first use
+tk_root = None
+
+def get_tk_root():
+    """
+    Returns the hidden Tkinter root window, creating it on first use.
+    Reusing it avoids starting a new Tcl interpreter for every dialog.
+    """
+    global tk_root
+    if tk_root is None:
+        # Tkinter is only imported when a dialog is needed; it is slow to load
+        import tkinter as tk
+        tk_root = tk.Tk()
+        tk_root.withdraw() # Hide the main window
+        atexit.register(tk_root.destroy)
+
+    # Set the window to be always on top and grab focus
+    tk_root.attributes("-topmost", True)
+    tk_root.lift()
+    tk_root.focus_force()
+    return tk_root
 
 def browse_for_file():
     """
     Opens a file dialog to allow the user to select any file.
     Returns the selected file path or an empty string if cancelled.
     """
-    # Create a Tkinter root window, but hide it
-    root = tk.Tk()
-    root.withdraw() # Hide the main window
-
-    # Set the window to be always on top and grab focus
-    root.attributes("-topmost", True)
-    root.lift()
-    root.focus_force()
+    from tkinter import filedialog
 
     file_path = filedialog.askopenfilename(
+        parent=get_tk_root(),
         title="Select File",
         filetypes=[("All files", "*.*"), ("Executable files", "*.exe")]
     )
-    root.destroy() # Destroy the root window after selection
     return file_path
 
 def browse_for_folder():
@@ -286,166 +470,336 @@ def browse_for_folder():
     Opens a folder dialog to allow the user to select a directory.
     Returns the selected folder path or an empty string if cancelled.
     """
-    root = tk.Tk()
-    root.withdraw() # Hide the main window
-
-    # Set the window to be always on top and grab focus
-    root.attributes("-topmost", True)
-    root.lift()
-    root.focus_force()
+    from tkinter import filedialog
 
     folder_path = filedialog.askdirectory(
+        parent=get_tk_root(),
         title="Select Folder"
     )
-    root.destroy()
     return folder_path
 
+# Whether the console understands ANSI escape sequences; None until first checked
+ansi_supported = None
+
+def enable_ansi_escapes():
+    """
+    Makes sure the console interprets ANSI escape sequences.
+    On Windows this turns on virtual terminal processing for stdout.
+    Returns False if the console cannot support them.
+    """
+    if sys.platform != "win32":
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11) # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception as e:
+        logger.debug(f"Could not enable ANSI escape processing: {e}")
+        return False
+
 def clear_screen():
     """Clears the console screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
-    logging.info("Screen cleared.")
+    global ansi_supported
+    if ansi_supported is None:
+        ansi_supported = enable_ansi_escapes()
+
+    if ansi_supported:
+        # Clear the screen and move the cursor home without spawning a shell
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
+    print("Screen cleared.")
 
 def display_path_troubleshooting(current_exe_dir):
     """Displays detailed instructions for manually adding Urun to PATH."""
-    logging.info("\n--- Urun PATH Setup Guide ---")
-    logging.info("It seems Urun's directory is not in your system's PATH, or the automatic setup failed.")
-    logging.info("This means Windows cannot find 'urun' when you type it in the Run dialog (Win+R).")
-    logging.info("\nTo fix this, please follow these simple steps to add Urun to your PATH manually:")
-    logging.info(f"1. Copy the path to Urun's folder: '{current_exe_dir}'")
-    logging.info("   (You can copy this exact line and paste it into a text editor if needed.)")
-    logging.info("2. Press 'Win + R', type 'sysdm.cpl', and press Enter.")
-    logging.info("3. In the 'System Properties' window, go to the 'Advanced' tab.")
-    logging.info("4. Click the 'Environment Variables...' button.")
-    logging.info("5. Under 'User variables for <Your Username>', find and select 'Path', then click 'Edit...'.")
-    logging.info("6. Click 'New' and paste the path you copied in step 1.")
-    logging.info("7. Click 'OK' on all open windows to save the changes.")
-    logging.info("\nIMPORTANT: After these steps, close ALL open Command Prompt/PowerShell windows and Run dialogs.")
-    logging.info("Then, open a NEW Run dialog (Win+R) and try typing 'urun' again.")
-    logging.info("---------------------------\n")
-
-def add_current_dir_to_path(executables, silent=False):
+    print("\n--- Urun PATH Setup Guide ---")
+    print("It seems Urun's directory is not in your system's PATH, or the automatic setup failed.")
+    print("This means Windows cannot find 'urun' when you type it in the Run dialog (Win+R).")
+    print("\nTo fix this, please follow these simple steps to add Urun to your PATH manually:")
+    print(f"1. Copy the path to Urun's folder: '{current_exe_dir}'")
+    print("   (You can copy this exact line and paste it into a text editor if needed.)")
+    print("2. Press 'Win + R', type 'sysdm.cpl', and press Enter.")
+    print("3. In the 'System Properties' window, go to the 'Advanced' tab.")
+    print("4. Click the 'Environment Variables...' button.")
+    print("5. Under 'User variables for <Your Username>', find and select 'Path', then click 'Edit...'.")
+    print("6. Click 'New' and paste the path you copied in step 1.")
+    print("7. Click 'OK' on all open windows to save the changes.")
+    print("\nIMPORTANT: After these steps, close ALL open Command Prompt/PowerShell windows and Run dialogs.")
+    print("Then, open a NEW Run dialog (Win+R) and try typing 'urun' again.")
+    print("---------------------------\n")
+
+def is_winreg_available():
+    """
+    Returns True if the 'winreg' module used for PATH modification can be imported.
+    Only probes for the module so the common launch path never has to load it.
+    """
+    return sys.platform == "win32" and importlib.util.find_spec('winreg') is not None
+
+def mark_path_set_attempted(store):
+    """Sets the 'path_set_attempted' flag, only marking the store dirty if it was not set yet."""
+    if not store.settings.get('path_set_attempted', False):
+        store.settings['path_set_attempted'] = True
+        store.mark_dirty()
+
+def broadcast_environment_change():
+    """
+    Notifies other windows that the user environment changed, without blocking Urun.
+    WM_SETTINGCHANGE carries a string pointer, so Windows refuses to deliver it
+    asynchronously (SendNotifyMessage fails for it); instead the synchronous
+    broadcast runs on a background thread.
+    """
+    def send():
+        try:
+            import ctypes
+            ctypes.windll.user32.SendMessageTimeoutW(
+                0xFFFF, # HWND_BROADCAST
+                0x001A, # WM_SETTINGCHANGE
+                0,      # wParam
+                "Environment", # lParam (string "Environment")
+                2,      # SMTO_ABORTIFHUNG
+                1000,   # timeout (milliseconds)
+                None    # lpdwResult (not needed)
+            )
+        except Exception as e:
+            logger.warning(f"Could not send WM_SETTINGCHANGE message: {e}")
+            logger.warning("Changes might require a system restart or new console session to take full effect.")
+
+    threading.Thread(target=send, daemon=True).start()
+
+def add_current_dir_to_path(store, silent=False):
     """
     Adds the directory of the running executable to the user's PATH environment variable on Windows.
     Asks for user confirmation if not silent.
-    Updates 'path_set_attempted' flag in executables.
+    Updates 'path_set_attempted' flag in the store.
     """
-    if sys.platform != "win32" or winreg is None:
+    if not is_winreg_available():
         if not silent:
-            logging.error("This feature is only available on Windows and requires the 'winreg' module.")
+            logger.error("This feature is only available on Windows and requires the 'winreg' module.")
         return False
+    import winreg # Imported here so that launching entries never pays for it
 
     current_exe_dir = os.path.dirname(os.path.abspath(sys.executable))
     
-    # Get current user PATH
+    # Open the user environment key once for both reading and writing PATH
     try:
-        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 'Environment', 0, winreg.KEY_ALL_ACCESS)
-        current_path, _ = winreg.QueryValueEx(key, 'Path')
-        winreg.CloseKey(key)
-    except FileNotFoundError:
-        current_path = "" # Path variable doesn't exist for user, create it
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 'Environment', 0, winreg.KEY_READ | winreg.KEY_SET_VALUE)
     except Exception as e:
-        logging.error(f"Error reading current user PATH: {e}", exc_info=True)
+        logger.error(f"Error opening the user environment registry key: {e}", exc_info=True)
         if not silent:
-            logging.info("Could not read user PATH. Please try running as administrator if issues persist.")
+            print("Could not read user PATH. Please try running as administrator if issues persist.")
         return False # Indicate failure
 
-    # Check if directory is already in PATH
-    path_components = [p.strip() for p in current_path.split(';') if p.strip()]
-    if current_exe_dir in path_components:
-        if not silent:
-            logging.info(f"'{current_exe_dir}' is already in your user's PATH.")
-            logging.info("No action needed. You can launch Urun from anywhere.")
-        # Mark as attempted even if already present
-        executables['path_set_attempted'] = True
-        save_executables(executables)
-        return True # Indicate success
-
-    # If not silent, ask for confirmation
-    confirm = 'y' # Default to 'y' for silent mode
-    if not silent:
-        confirm = input(f"Urun can be launched easily from anywhere by adding '{current_exe_dir}' to your user's system PATH. Do you want to do this now? (y/n): ").strip().lower()
-
-    if confirm == 'y':
-        new_path = f"{current_path};{current_exe_dir}" if current_path else current_exe_dir
+    try:
+        # Get current user PATH
         try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 'Environment', 0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, 'Path', 0, winreg.REG_EXPAND_SZ, new_path) # Use REG_EXPAND_SZ for paths
-            winreg.CloseKey(key)
+            current_path, _ = winreg.QueryValueEx(key, 'Path')
+        except FileNotFoundError:
+            current_path = "" # Path variable doesn't exist for user, create it
+        except Exception as e:
+            logger.error(f"Error reading current user PATH: {e}", exc_info=True)
+            if not silent:
+                print("Could not read user PATH. Please try running as administrator if issues persist.")
+            return False # Indicate failure
+
+        # Check if directory is already in PATH
+        path_components = {p.strip().lower() for p in current_path.split(';') if p.strip()}
+        if current_exe_dir.lower() in path_components:
+            if not silent:
+                print(f"'{current_exe_dir}' is already in your user's PATH.")
+                print("No action needed. You can launch Urun from anywhere.")
+            # Mark as attempted even if already present
+            mark_path_set_attempted(store)
+            return True # Indicate success
+
+        # If not silent, ask for confirmation
+        confirm = 'y' # Default to 'y' for silent mode
+        if not silent:
+            confirm = input(f"Urun can be launched easily from anywhere by adding '{current_exe_dir}' to your user's system PATH. Do you want to do this now? (y/n): ").strip().lower()
 
-            # Inform other processes about the change (optional but good practice)
+        if confirm == 'y':
+            new_path = f"{current_path};{current_exe_dir}" if current_path else current_exe_dir
             try:
-                import ctypes
-                ctypes.windll.user32.SendMessageTimeoutA(
-                    0xFFFF, # HWND_BROADCAST
-                    0x001A, # WM_SETTINGCHANGE
-                    0,      # wParam
-                    "Environment", # lParam (string "Environment")
-                    2,      # SMTO_ABORTIFHUNG
-                    1000    # timeout (milliseconds)
-                )
+                winreg.SetValueEx(key, 'Path', 0, winreg.REG_EXPAND_SZ, new_path) # Use REG_EXPAND_SZ for paths
+
+                # Inform other processes about the change (optional but good practice)
+                broadcast_environment_change()
+
+                print(f"Successfully added '{current_exe_dir}' to your user's PATH.")
+                print("Please open a NEW Command Prompt or Run dialog (Win+R) for changes to take effect.")
+                print("Then you can simply type 'urun' to launch it.")
+                mark_path_set_attempted(store)
+                return True # Indicate success
             except Exception as e:
-                logging.warning(f"Could not send WM_SETTINGCHANGE message: {e}")
-                logging.warning("Changes might require a system restart or new console session to take full effect.")
-
-            logging.info(f"Successfully added '{current_exe_dir}' to your user's PATH.")
-            logging.info("Please open a NEW Command Prompt or Run dialog (Win+R) for changes to take effect.")
-            logging.info("Then you can simply type 'urun' to launch it.")
-            executables['path_set_attempted'] = True
-            save_executables(executables)
-            return True # Indicate success
-        except Exception as e:
-            logging.error(f"Error adding '{current_exe_dir}' to PATH: {e}", exc_info=True)
-            logging.info("Failed to modify PATH. Please try running Urun as administrator if this issue persists.")
-            # Even if it fails, we mark it as attempted to avoid re-prompting on next launch
-            executables['path_set_attempted'] = True
-            save_executables(executables)
-            return False # Indicate failure
-    else:
-        logging.info("Adding to PATH cancelled by user.")
-        executables['path_set_attempted'] = True # Mark as attempted to avoid re-prompting
-        save_executables(executables)
-        return False # Indicate cancellation
+                logger.error(f"Error adding '{current_exe_dir}' to PATH: {e}", exc_info=True)
+                print("Failed to modify PATH. Please try running Urun as administrator if this issue persists.")
+                # Even if it fails, we mark it as attempted to avoid re-prompting on next launch
+                mark_path_set_attempted(store)
+                return False # Indicate failure
+        else:
+            print("Adding to PATH cancelled by user.")
+            mark_path_set_attempted(store) # Mark as attempted to avoid re-prompting
+            return False # Indicate cancellation
+    finally:
+        winreg.CloseKey(key)
 
 def display_help():
     """Displays available commands."""
-    logging.info("\n--- Urun Commands ---")
-    logging.info("  add <alias> <path>      - Add a new file entry (e.g., .exe, .mp4, .pdf).")
-    logging.info("                            Example: add mygame C:\\Games\\MyGame.exe")
-    logging.info("                            Example: add mydoc C:\\Docs\\Report.pdf")
-    logging.info("  browsify <alias>        - Add a new file entry by browsing for the file.")
-    logging.info("                            Example: browsify myimage")
-    logging.info("  add_folder <alias> <path> - Add a new folder entry.")
-    logging.info("                            Example: add_folder mydocs C:\\Users\\Me\\Documents")
-    logging.info("  browsefolder <alias>    - Add a new folder entry by browsing for the folder.")
-    logging.info("                            Example: browsefolder myphotos")
-    logging.info("  update <alias> <new_path> - Update the path for an existing entry.")
-    logging.info("                            Example: update mygame D:\\NewGames\\MyGame.exe")
-    logging.info("  delete <alias>          - Remove an existing entry alias (requires confirmation).")
-    logging.info("                            Example: delete mygame")
-    logging.info("  rename <old_alias> <new_alias> - Rename an existing alias.")
-    logging.info("                            Example: rename mygame myfavoritegame")
-    logging.info("  list                    - List all registered entries.")
+    print("\n--- Urun Commands ---")
+    print("  add <alias> <path>      - Add a new file entry (e.g., .exe, .mp4, .pdf).")
+    print("                            Example: add mygame C:\\Games\\MyGame.exe")
+    print("                            Example: add mydoc C:\\Docs\\Report.pdf")
+    print("  browsify <alias>        - Add a new file entry by browsing for the file.")
+    print("                            Example: browsify myimage")
+    print("  add_folder <alias> <path> - Add a new folder entry.")
+    print("                            Example: add_folder mydocs C:\\Users\\Me\\Documents")
+    print("  browsefolder <alias>    - Add a new folder entry by browsing for the folder.")
+    print("                            Example: browsefolder myphotos")
+    print("  update <alias> <new_path> - Update the path for an existing entry.")
+    print("                            Example: update mygame D:\\NewGames\\MyGame.exe")
+    print("  delete <alias>          - Remove an existing entry alias (requires confirmation).")
+    print("                            Example: delete mygame")
+    print("  rename <old_alias> <new_alias> - Rename an existing alias.")
+    print("                            Example: rename mygame myfavoritegame")
+    print("  list                    - List all registered entries.")
     # Removed "openfolder" from help
-    logging.info("  setpath                 - Manually add Urun to your user's system PATH for easy launching.")
-    logging.info("  <alias>                 - Launch an entry by its alias.")
-    logging.info("                            Example: mygame (launches the executable)")
-    logging.info("                            Example: mydocs (opens the folder)")
-    logging.info("                            Example: myvideo (opens the video with default player)")
-    logging.info("  <partial_alias>         - Search for entries matching the partial alias.")
-    logging.info("  clear                   - Clear the console screen.")
-    logging.info("  help                    - Display this help message.")
-    logging.info("  exit / quit             - Exit the launcher.")
-    logging.info("---------------------------\n")
+    print("  setpath                 - Manually add Urun to your user's system PATH for easy launching.")
+    print("  <alias>                 - Launch an entry by its alias.")
+    print("                            Example: mygame (launches the executable)")
+    print("                            Example: mydocs (opens the folder)")
+    print("                            Example: myvideo (opens the video with default player)")
+    print("  <partial_alias>         - Search for entries matching the partial alias.")
+    print("  clear                   - Clear the console screen.")
+    print("  help                    - Display this help message.")
+    print("  exit / quit             - Exit the launcher.")
+    print("---------------------------\n")
+
+# --- Command Handlers ---
+def handle_add(parts, store):
+    """Handles 'add <alias> <path>'."""
+    if len(parts) == 3:
+        alias = parts[1]
+        path = parts[2].strip('"').strip("'") # Remove potential quotes from path
+        add_entry(store, alias, path, entry_type="file")
+    else:
+        print("Usage: add <alias> <path_to_file>")
+        print("Example: add mygame C:\\Games\\MyGame.exe")
+
+def handle_browsify(parts, store):
+    """Handles 'browsify <alias>'."""
+    if len(parts) == 2:
+        alias = parts[1]
+        print(f"Please select the file for alias '{alias}' in the pop-up window...")
+        selected_path = browse_for_file()
+        if selected_path:
+            add_entry(store, alias, selected_path, entry_type="file")
+        else:
+            print("File selection cancelled.")
+    else:
+        print("Usage: browsify <alias>")
+        print("Example: browsify myimage")
+
+def handle_add_folder(parts, store):
+    """Handles 'add_folder <alias> <path>'."""
+    if len(parts) == 3:
+        alias = parts[1]
+        path = parts[2].strip('"').strip("'")
+        add_entry(store, alias, path, entry_type="folder")
+    else:
+        print("Usage: add_folder <alias> <path_to_folder>")
+        print("Example: add_folder mydocs C:\\Users\\Me\\Documents")
+
+def handle_browsefolder(parts, store):
+    """Handles 'browsefolder <alias>'."""
+    if len(parts) == 2:
+        alias = parts[1]
+        print(f"Please select the folder for alias '{alias}' in the pop-up window...")
+        selected_path = browse_for_folder()
+        if selected_path:
+            add_entry(store, alias, selected_path, entry_type="folder")
+        else:
+            print("Folder selection cancelled.")
+    else:
+        print("Usage: browsefolder <alias>")
+        print("Example: browsefolder myphotos")
+
+def handle_update(parts, store):
+    """Handles 'update <alias> <new_path>'."""
+    if len(parts) == 3:
+        alias = parts[1]
+        new_path = parts[2].strip('"').strip("'")
+        update_entry(store, alias, new_path)
+    else:
+        print("Usage: update <alias> <new_path>")
+        print("Example: update mygame D:\\NewGames\\MyGame.exe")
+
+def handle_delete(parts, store):
+    """Handles 'delete <alias>'."""
+    if len(parts) == 2:
+        alias = parts[1]
+        delete_executable(store, alias)
+    else:
+        print("Usage: delete <alias>")
+        print("Example: delete mygame")
+
+def handle_rename(parts, store):
+    """Handles 'rename <old_alias> <new_alias>'."""
+    if len(parts) == 3:
+        old_alias = parts[1]
+        new_alias = parts[2]
+        rename_alias(store, old_alias, new_alias)
+    else:
+        print("Usage: rename <old_alias> <new_alias>")
+        print("Example: rename nfs nfs_shift")
+
+def handle_list(parts, store):
+    """Handles 'list'."""
+    list_executables(store)
+
+def handle_setpath(parts, store):
+    """Handles 'setpath'."""
+    add_current_dir_to_path(store, silent=False)
+
+def handle_clear(parts, store):
+    """Handles 'clear'."""
+    clear_screen()
+
+def handle_help(parts, store):
+    """Handles 'help'."""
+    display_help()
+
+# Maps each command word to its handler; None marks the commands that exit Urun
+COMMANDS = {
+    'add': handle_add,
+    'browsify': handle_browsify, # Renamed from add_browse
+    'add_folder': handle_add_folder,
+    'browsefolder': handle_browsefolder, # Renamed from add_folder_browse
+    'update': handle_update,
+    'delete': handle_delete,
+    'rename': handle_rename,
+    'list': handle_list,
+    'setpath': handle_setpath,
+    'clear': handle_clear,
+    'help': handle_help,
+    'exit': None,
+    'quit': None,
+}
 
 def main():
     """Main function for the CLI launcher."""
-    executables = load_executables()
-    logging.info("Welcome to Urun - Your Custom Launcher!")
+    store = ExecutableStore(load_executables())
+    atexit.register(store.flush)
+    print("Welcome to Urun - Your Custom Launcher!")
 
     # --- Automated PATH setup check ---
-    if sys.platform == "win32" and winreg is not None:
+    if is_winreg_available():
         current_exe_dir = os.path.dirname(os.path.abspath(sys.executable))
-        path_set_attempted = executables.get('path_set_attempted', False)
+        path_set_attempted = store.settings.get('path_set_attempted', False)
         
         # Check if current_exe_dir is actually in the current effective PATH
         # os.environ.get('PATH') gives the current process's PATH
@@ -454,19 +808,17 @@ def main():
         if not is_in_current_path:
             if not path_set_attempted:
                 # First time Urun is run and not in PATH, or previous attempt wasn't marked
-                logging.info(f"\nUrun's directory is not currently in your system PATH.")
+                print(f"\nUrun's directory is not currently in your system PATH.")
                 # Call add_current_dir_to_path, which will prompt the user and handle saving the flag
-                add_current_dir_to_path(executables, silent=False)
+                add_current_dir_to_path(store, silent=False)
             else:
                 # PATH setup was attempted/declined before, and it's still not in PATH
                 # Provide manual troubleshooting steps
                 display_path_troubleshooting(current_exe_dir)
         else:
             # If it's in PATH, ensure the 'path_set_attempted' flag is set for future launches
-            if not path_set_attempted:
-                executables['path_set_attempted'] = True
-                save_executables(executables)
-            logging.info(f"Urun's directory '{current_exe_dir}' is already in your PATH.")
+            mark_path_set_attempted(store)
+            print(f"Urun's directory '{current_exe_dir}' is already in your PATH.")
     # --- End Automated PATH setup check ---
 
     display_help()
@@ -480,97 +832,30 @@ def main():
             parts = command.split(maxsplit=2) # Split into command, alias, and path (if exists)
             action = parts[0].lower()
 
-            if action == 'exit' or action == 'quit':
-                logging.info("Exiting Urun. Goodbye!")
-                break
-            elif action == 'add':
-                if len(parts) == 3:
-                    alias = parts[1]
-                    path = parts[2].strip('"').strip("'") # Remove potential quotes from path
-                    add_entry(executables, alias, path, entry_type="file")
-                else:
-                    logging.info("Usage: add <alias> <path_to_file>")
-                    logging.info("Example: add mygame C:\\Games\\MyGame.exe")
-            elif action == 'browsify': # Renamed from add_browse
-                if len(parts) == 2:
-                    alias = parts[1]
-                    logging.info(f"Please select the file for alias '{alias}' in the pop-up window...")
-                    selected_path = browse_for_file()
-                    if selected_path:
-                        add_entry(executables, alias, selected_path, entry_type="file")
-                    else:
-                        logging.info("File selection cancelled.")
-                else:
-                    logging.info("Usage: browsify <alias>")
-                    logging.info("Example: browsify myimage")
-            elif action == 'add_folder':
-                if len(parts) == 3:
-                    alias = parts[1]
-                    path = parts[2].strip('"').strip("'")
-                    add_entry(executables, alias, path, entry_type="folder")
-                else:
-                    logging.info("Usage: add_folder <alias> <path_to_folder>")
-                    logging.info("Example: add_folder mydocs C:\\Users\\Me\\Documents")
-            elif action == 'browsefolder': # Renamed from add_folder_browse
-                if len(parts) == 2:
-                    alias = parts[1]
-                    logging.info(f"Please select the folder for alias '{alias}' in the pop-up window...")
-                    selected_path = browse_for_folder()
-                    if selected_path:
-                        add_entry(executables, alias, selected_path, entry_type="folder")
-                    else:
-                        logging.info("Folder selection cancelled.")
-                else:
-                    logging.info("Usage: browsefolder <alias>")
-                    logging.info("Example: browsefolder myphotos")
-            elif action == 'update':
-                if len(parts) == 3:
-                    alias = parts[1]
-                    new_path = parts[2].strip('"').strip("'")
-                    update_entry(executables, alias, new_path)
-                else:
-                    logging.info("Usage: update <alias> <new_path>")
-                    logging.info("Example: update mygame D:\\NewGames\\MyGame.exe")
-            elif action == 'delete':
-                if len(parts) == 2:
-                    alias = parts[1]
-                    delete_executable(executables, alias)
-                else:
-                    logging.info("Usage: delete <alias>")
-                    logging.info("Example: delete mygame")
-            elif action == 'rename':
-                if len(parts) == 3:
-                    old_alias = parts[1]
-                    new_alias = parts[2]
-                    rename_alias(executables, old_alias, new_alias)
-                else:
-                    logging.info("Usage: rename <old_alias> <new_alias>")
-                    logging.info("Example: rename nfs nfs_shift")
-            elif action == 'list':
-                list_executables(executables)
-            # Removed the openfolder command block
-            elif action == 'setpath':
-                # Manual setpath call
-                add_current_dir_to_path(executables, silent=False)
-            elif action == 'clear':
-                clear_screen()
-            elif action == 'help':
-                display_help()
+            if action in COMMANDS:
+                handler = COMMANDS[action]
+                if handler is None:
+                    print("Exiting Urun. Goodbye!")
+                    break
+                handler(parts, store)
             else:
                 # Assume it's an alias or a search query to launch
-                search_and_launch(executables, command)
+                search_and_launch(store, command)
         except KeyboardInterrupt:
-            logging.info("\nExiting Urun. Goodbye!")
+            print("\nExiting Urun. Goodbye!")
             break
         except Exception as e:
-            logging.error(f"An unexpected error occurred: {e}")
-            logging.info("Please try again or restart Urun.")
-            logging.critical(f"Unhandled exception in main loop: {e}", exc_info=True)
+            logger.error(f"An unexpected error occurred: {e}")
+            print("Please try again or restart Urun.")
+            logger.critical(f"Unhandled exception in main loop: {e}", exc_info=True)
+        finally:
+            # Persist any changes made by this command in a single write
+            store.flush()
 
 if __name__ == "__main__":
     # Check if running on Windows, as os.startfile is Windows-specific
     if sys.platform != "win32":
-        logging.warning("Warning: Urun uses 'os.startfile' which is primarily for Windows.")
-        logging.warning("It might not function as expected on other operating systems for launching files/folders.")
-        logging.warning("Consider using 'subprocess.Popen' with platform-specific commands for cross-platform compatibility if needed.")
+        logger.warning("Warning: Urun uses 'os.startfile' which is primarily for Windows.")
+        logger.warning("It might not function as expected on other operating systems for launching files/folders.")
+        logger.warning("Consider using 'subprocess.Popen' with platform-specific commands for cross-platform compatibility if needed.")
     main()